@@ -7,28 +7,30 @@ MOVES = [(-1,0,'N'), (1,0,'S'), (0,1,'E'), (0,-1,'W')]
 def parse_world_file(world_file):
     """
     Parses the input world file to create the grid, robot's start position, and dirty cells.
+    Cells are numbered row * ncols + col and the grid is (nrows, ncols, obstacle_bits) where bit i is set if cell i is blocked.
     Args: world_file (str)
-    Returns: tuple: (grid, robot_pos, dirty_cells) 
+    Returns: tuple: (grid, robot_pos, dirty_idx) where dirty_idx maps each dirty cell to its bit in the dirt bitmask
     """
     with open(world_file) as f:
         content = [line.rstrip() for line in f.readlines()]
 
+    cols = int(content[0])
     rows = int(content[1])
-    grid = []
+    obstacle_bits = 0
     robot_pos = None
-    dirty_cells = set()
+    dirty_idx = {}
 
     for row_idx in range(rows):
-        row = list(content[row_idx + 2])
-        grid.append(row)
-
-        for col_idx, cell in enumerate(row):
-            if cell == '@':
-                robot_pos = (row_idx, col_idx)
+        for col_idx, cell in enumerate(content[row_idx + 2]):
+            pos = row_idx * cols + col_idx
+            if cell == '#':
+                obstacle_bits |= 1 << pos
+            elif cell == '@':
+                robot_pos = pos
             elif cell == '*':
-                dirty_cells.add((row_idx, col_idx))
+                dirty_idx[pos] = len(dirty_idx)
 
-    return grid, robot_pos, dirty_cells
+    return (rows, cols, obstacle_bits), robot_pos, dirty_idx
 
 def print_results(path, nodes_generated, nodes_expanded):
     """
@@ -45,101 +47,256 @@ def print_results(path, nodes_generated, nodes_expanded):
     print(f"{nodes_generated} nodes generated")
     print(f"{nodes_expanded} nodes expanded")
 
-def get_neighbors(grid, pos):
+def get_neighbors(nrows, ncols, obstacle_bits, pos):
     """
     Returns valid neighboring cells to move to while ignoring obstacles.
-    Args: grid (list), pos (tuple)
-    Returns: list: ((new_row, new_col), action)
+    Args: nrows (int), ncols (int), obstacle_bits (int), pos (int)
+    Returns: list: (new_pos, action)
     """
     neighbors = []
-    x, y = pos
-    for dx, dy, action in MOVES:
-        new_x, new_y = x + dx, y + dy
+    row = pos // ncols
+    col = pos - row * ncols
+    for d_row, d_col, action in MOVES:
+        new_row, new_col = row + d_row, col + d_col
 
-        # checks for obstacles and makes sure it moves inside the grid 
-        if 0 <= new_x < len(grid) and 0 <= new_y < len(grid[0]) and grid[new_x][new_y] != '#':
-            neighbors.append(((new_x, new_y), action))
+        # makes sure it moves inside the grid and checks the obstacle bit
+        if 0 <= new_row < nrows and 0 <= new_col < ncols:
+            new_pos = new_row * ncols + new_col
+            if not (obstacle_bits >> new_pos) & 1:
+                neighbors.append((new_pos, action))
 
     return neighbors
 
-def dfs(grid, starting_pos, dirty_cells):
+def reconstruct_path(nodes, node_id):
+    """
+    Rebuilds the path to a search node by following parent pointers back to the start.
+    Args: nodes (list), node_id (int)
+    Returns: list: actions from the start to the node
+    """
+    path = []
+    parent_id, action = nodes[node_id]
+    while parent_id is not None:
+        path.append(action)
+        parent_id, action = nodes[parent_id]
+    path.reverse()
+    return path
+
+def dfs(grid, starting_pos, dirty_idx):
     """
     Depth-First Search algorithm to clean dirty cells.
-    Args: grid (list), starting_pos (tuple), dirty_cells (set)
+    Keeps one path list that grows going down a branch and shrinks when backtracking out of it.
+    Args: grid (tuple), starting_pos (int), dirty_idx (dict)
     Returns: tuple: (path, nodes_generated, nodes_expanded)
     """
-    start_state = (starting_pos, frozenset(dirty_cells))
-    stack = deque([(start_state, [])]) # (state, path) where path is the moves it made 
+    nrows, ncols, obstacle_bits = grid
+    start_state = (starting_pos, (1 << len(dirty_idx)) - 1)    # bit i of the dirt mask is set while dirty cell i is dirty
+    stack = deque([(start_state, None)]) # (state, action that led to it) or None to mark where to backtrack
+    path = []
     visited = set([start_state])
     nodes_generated = 1
     nodes_expanded = 0
     
     while stack:
-        (pos, remaining_dirt), path = stack.pop()
+        frame = stack.pop()
+
+        # finished everything below this node so take its action back off the path
+        if frame is None:
+            path.pop()
+            continue
+
+        (pos, remaining_dirt), action = frame
         nodes_expanded += 1
+        if action is not None:
+            path.append(action)
+            stack.append(None)
         
         # done cleaning 
         if not remaining_dirt:
-            return path, nodes_generated, nodes_expanded
+            return path[:], nodes_generated, nodes_expanded
         
         # update dirty cells, robot position, and visited cells 
-        if pos in remaining_dirt:
-            new_dirty = remaining_dirt - {pos}
+        if pos in dirty_idx and remaining_dirt & (1 << dirty_idx[pos]):
+            new_dirty = remaining_dirt & ~(1 << dirty_idx[pos])
             new_state = (pos, new_dirty)
 
             if new_state not in visited:
                 visited.add(new_state)
-                stack.append((new_state, path + ['V']))
+                stack.append((new_state, 'V'))
                 nodes_generated += 1
                 continue 
         
         # go through valid cells and test out potential paths
-        for (new_x, new_y), action in get_neighbors(grid, pos):
-            new_state = ((new_x, new_y), remaining_dirt)
+        for new_pos, action in get_neighbors(nrows, ncols, obstacle_bits, pos):
+            new_state = (new_pos, remaining_dirt)
 
             if new_state not in visited:
                 visited.add(new_state)
-                stack.append((new_state, path + [action]))
+                stack.append((new_state, action))
                 nodes_generated += 1
     
     return None, nodes_generated, nodes_expanded
 
-def ucs(grid, starting_pos, dirty_cells):
+def ucs(grid, starting_pos, dirty_idx):
     """
     Uniform-Cost Search algorithm to clean dirty cells.
-    Args: grid (list), starting_pos (tuple), dirty_cells (set)
+    Args: grid (tuple), starting_pos (int), dirty_idx (dict)
     Returns: tuple: (path, nodes_generated, nodes_expanded)
     """
-    start_state = (starting_pos, frozenset(dirty_cells))
-    queue = [(0, start_state, [])] # (cost, state, path)
-    visited = {}
+    nrows, ncols, obstacle_bits = grid
+    start_state = (starting_pos, (1 << len(dirty_idx)) - 1)    # bit i of the dirt mask is set while dirty cell i is dirty
+    nodes = [(None, None)]  # (parent_id, action) per search node so paths aren't copied on every push
+    queue = [(0, start_state, 0)] # (cost, state, node_id)
+    best_g = {start_state: 0}   # cheapest cost found so far for each state
     nodes_generated = 1
     nodes_expanded = 0
 
     while queue:
-        cost, (pos, remaining_dirt), path = heapq.heappop(queue)
+        # peek instead of popping so the first successor can take the top entry's place with one heapreplace
+        cost, state, node_id = queue[0]
+        pos, remaining_dirt = state
 
         if not remaining_dirt:
-            return path, nodes_generated, nodes_expanded
+            return reconstruct_path(nodes, node_id), nodes_generated, nodes_expanded
         
-        # check if it has been visited and that it is the cheapest path possible
-        if (pos, remaining_dirt) in visited and visited[(pos, remaining_dirt)] <= cost:
+        # skip stale entries that were pushed before a cheaper path to this state was found
+        if cost > best_g[state]:
+            heapq.heappop(queue)
             continue
 
-        visited[(pos, remaining_dirt)] = cost
         nodes_expanded += 1
 
         # update dirty cells, robot position, and visited cells 
-        if pos in remaining_dirt:
-            new_dirt = remaining_dirt - {pos}
-            new_state = (pos, new_dirt)
-            heapq.heappush(queue, (cost + 1, new_state, path + ['V']))
-            nodes_generated += 1
+        successors = []
+        if pos in dirty_idx and remaining_dirt & (1 << dirty_idx[pos]):
+            successors.append(((pos, remaining_dirt & ~(1 << dirty_idx[pos])), 'V'))
+        for new_pos, action in get_neighbors(nrows, ncols, obstacle_bits, pos):
+            successors.append(((new_pos, remaining_dirt), action))
 
-        # go through valid cells and test out potential paths
-        for (new_x, new_y), action in get_neighbors(grid, pos):
-            new_state = ((new_x, new_y), remaining_dirt)
-            heapq.heappush(queue, (cost + 1, new_state, path + [action]))
+        # only push states whose cost improves on the best one seen so far
+        popped = False
+        for new_state, action in successors:
+            if cost + 1 < best_g.get(new_state, float('inf')):
+                best_g[new_state] = cost + 1
+                nodes.append((node_id, action))
+                if popped:
+                    heapq.heappush(queue, (cost + 1, new_state, len(nodes) - 1))
+                else:
+                    heapq.heapreplace(queue, (cost + 1, new_state, len(nodes) - 1))
+                    popped = True
+                nodes_generated += 1
+
+        if not popped:
+            heapq.heappop(queue)
+
+    return None, nodes_generated, nodes_expanded
+
+
+def bfs_distances(grid, source):
+    """
+    Finds the shortest number of moves from a cell to every reachable cell.
+    Args: grid (tuple), source (int)
+    Returns: dict: {pos: distance}
+    """
+    nrows, ncols, obstacle_bits = grid
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        pos = queue.popleft()
+        for new_pos, _ in get_neighbors(nrows, ncols, obstacle_bits, pos):
+            if new_pos not in distances:
+                distances[new_pos] = distances[pos] + 1
+                queue.append(new_pos)
+    return distances
+
+def mst_weight(remaining_dirt, dirty_cells, dirty_distances, mst_cache):
+    """
+    Finds the weight of the minimum spanning tree over the remaining dirty cells using Prim's algorithm.
+    Args: remaining_dirt (int), dirty_cells (list), dirty_distances (list), mst_cache (dict)
+    Returns: int or float: inf when some remaining dirty cells can't reach each other
+    """
+    if remaining_dirt in mst_cache:
+        return mst_cache[remaining_dirt]
+
+    remaining = [i for i in range(len(dirty_cells)) if remaining_dirt & (1 << i)]
+    weight = 0
+
+    # cheapest edge from the tree to each cell not in the tree yet, starting the tree from the first cell
+    best_edge = {i: dirty_distances[remaining[0]].get(dirty_cells[i], float('inf')) for i in remaining[1:]}
+    while best_edge:
+        closest = min(best_edge, key=best_edge.get)
+        weight += best_edge.pop(closest)
+        for i in best_edge:
+            best_edge[i] = min(best_edge[i], dirty_distances[closest].get(dirty_cells[i], float('inf')))
+
+    mst_cache[remaining_dirt] = weight
+    return weight
+
+def heuristic(pos, remaining_dirt, dirty_cells, dirty_distances, mst_cache):
+    """
+    Estimates the remaining cost: moves to the nearest dirty cell, plus the MST over the dirty cells, plus one vacuum per dirty cell.
+    Never overestimates since any cleaning route walks to some dirty cell and then connects all of them.
+    Args: pos (int), remaining_dirt (int), dirty_cells (list), dirty_distances (list), mst_cache (dict)
+    Returns: int or float: inf when the remaining dirt can't all be cleaned from pos
+    """
+    if not remaining_dirt:
+        return 0
+
+    remaining = [i for i in range(len(dirty_cells)) if remaining_dirt & (1 << i)]
+    nearest = min(dirty_distances[i].get(pos, float('inf')) for i in remaining)
+    return nearest + mst_weight(remaining_dirt, dirty_cells, dirty_distances, mst_cache) + len(remaining)
+
+def astar(grid, starting_pos, dirty_idx):
+    """
+    A* Search algorithm to clean dirty cells, guided by the MST heuristic.
+    Args: grid (tuple), starting_pos (int), dirty_idx (dict)
+    Returns: tuple: (path, nodes_generated, nodes_expanded)
+    """
+    # shortest distances from each dirty cell to every cell, used by the heuristic
+    dirty_cells = sorted(dirty_idx, key=dirty_idx.get)
+    dirty_distances = [bfs_distances(grid, cell) for cell in dirty_cells]
+    mst_cache = {}
+    h_cache = {}    # heuristic per (pos, remaining_dirt) since states get reached many times
+    nrows, ncols, obstacle_bits = grid
+
+    start_dirt = (1 << len(dirty_idx)) - 1    # bit i of the dirt mask is set while dirty cell i is dirty
+    start_h = heuristic(starting_pos, start_dirt, dirty_cells, dirty_distances, mst_cache)
+    nodes = [(None, None)]  # (parent_id, action) per search node so paths aren't copied on every push
+    queue = [(start_h, 0, starting_pos, start_dirt, 0)] # (cost + heuristic, cost, pos, remaining_dirt, node_id)
+    closed = set()
+    nodes_generated = 1
+    nodes_expanded = 0
+
+    while queue:
+        _, cost, pos, remaining_dirt, node_id = heapq.heappop(queue)
+
+        if not remaining_dirt:
+            return reconstruct_path(nodes, node_id), nodes_generated, nodes_expanded
+
+        # the heuristic is consistent so the first time a state is popped it has its cheapest cost
+        if (pos, remaining_dirt) in closed:
+            continue
+
+        closed.add((pos, remaining_dirt))
+        nodes_expanded += 1
+
+        successors = []
+        if pos in dirty_idx and remaining_dirt & (1 << dirty_idx[pos]):
+            successors.append((pos, remaining_dirt & ~(1 << dirty_idx[pos]), 'V'))
+        for new_pos, action in get_neighbors(nrows, ncols, obstacle_bits, pos):
+            successors.append((new_pos, remaining_dirt, action))
+
+        # skip states that are already expanded or can't lead to a clean world
+        for new_pos, new_dirt, action in successors:
+            if (new_pos, new_dirt) in closed:
+                continue
+            h = h_cache.get((new_pos, new_dirt))
+            if h is None:
+                h = heuristic(new_pos, new_dirt, dirty_cells, dirty_distances, mst_cache)
+                h_cache[(new_pos, new_dirt)] = h
+            if h == float('inf'):
+                continue
+            nodes.append((node_id, action))
+            heapq.heappush(queue, (cost + 1 + h, cost + 1, new_pos, new_dirt, len(nodes) - 1))
             nodes_generated += 1
 
     return None, nodes_generated, nodes_expanded
@@ -155,16 +312,19 @@ def main():
 
     algorithm = sys.argv[1]
     world_file = sys.argv[2]
-    grid, starting_pos, dirty_cells = parse_world_file(world_file)
+    grid, starting_pos, dirty_idx = parse_world_file(world_file)
 
     if algorithm == "depth-first":
-        path, nodes_generated, nodes_expanded = dfs(grid, starting_pos, dirty_cells)
+        path, nodes_generated, nodes_expanded = dfs(grid, starting_pos, dirty_idx)
         print_results(path, nodes_generated, nodes_expanded)
     elif algorithm == "uniform-cost":
-        path, nodes_generated, nodes_expanded = ucs(grid, starting_pos, dirty_cells)
+        path, nodes_generated, nodes_expanded = ucs(grid, starting_pos, dirty_idx)
+        print_results(path, nodes_generated, nodes_expanded)
+    elif algorithm == "a-star":
+        path, nodes_generated, nodes_expanded = astar(grid, starting_pos, dirty_idx)
         print_results(path, nodes_generated, nodes_expanded)
     else:
-        print("Invalid algorithm. Only supports uniform-cost or depth-first")
+        print("Invalid algorithm. Only supports uniform-cost, depth-first, or a-star")
         sys.exit(1)
 
 if __name__ == "__main__":
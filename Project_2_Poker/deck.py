@@ -1,63 +1,36 @@
-import random
-
-class Card:
-    def __init__(self, card_num, suit):
-        """Initializes a Card with a number and a suit"""
-        self.card_num = card_num
-        self.suit = suit
-
-    def __repr__(self):
-        return f"{self.card_num}{self.suit}"
-
-    def __eq__(self, other):
-        """Checks equality of card objects"""
-        return isinstance(other, Card) and self.card_num == other.card_num and self.suit == other.suit
-
-    def __hash__(self):
-        """Allows card objects to be stored in sets and dictionary keys"""
-        return hash((self.card_num, self.suit))
-
-class Deck:
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        """Creates a full deck and shuffles it"""
-        card_nums = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-        suits = ['C', 'D', 'H', 'S']
-        self.cards = [Card(card_num, suit) for card_num in card_nums for suit in suits]
-        random.shuffle(self.cards)
-
-    def deal_card(self):
-        """
-        Deals one card from the top of the deck
-        Args: N/A
-        Returns: Card or None 
-        """
-        if not self.cards:
-            return None
-        return self.cards.pop()
-    
-    def deal_hand(self, num_cards):
-        """
-        Deals a specified number of cards as a list
-        Args: num_cards (int)
-        Returns: list[Card]
-        """
-        return [self.deal_card() for _ in range(num_cards)]
-    
-    def remove_card(self, card):
-        """
-        Removes a specific card from the deck
-        Args: card (Card)
-        Returns: N/A
-        """
-        self.cards = [c for c in self.cards if c != card]
-
-    def remaining_cards(self):
-        """
-        Returns a copy of the list of cards still in the deck
-        Args: N/A
-        Returns: list[Card]
-        """
-        return self.cards[:]
\ No newline at end of file
+CARD_NUMS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+SUITS = ['C', 'D', 'H', 'S']
+
+# a card is packed into one small int: low 4 bits hold the rank (2..14) and bits 4-5 hold the suit index
+RANK_BITS = {card_num: rank for rank, card_num in enumerate(CARD_NUMS, start=2)}
+SUIT_BITS = {suit: suit_idx for suit_idx, suit in enumerate(SUITS)}
+
+def make_card(card_num, suit):
+    """
+    Packs a card number and suit into a single int
+    Args: card_num (str), suit (str)
+    Returns: int
+    """
+    return (SUIT_BITS[suit] << 4) | RANK_BITS[card_num]
+
+# every card in a fixed (unshuffled) order
+FULL_DECK = tuple(make_card(card_num, suit) for card_num in CARD_NUMS for suit in SUITS)
+
+def card_to_str(card):
+    """
+    Converts a packed card back to its string form like 'JD'
+    Args: card (int)
+    Returns: str
+    """
+    return f"{CARD_NUMS[(card & 0xF) - 2]}{SUITS[card >> 4]}"
+
+# every card string like 'JD' mapped to its packed card, built once so parsing is a single lookup
+CARD_LOOKUP = {card_to_str(card): card for card in FULL_DECK}
+
+def card_to_idx(card):
+    """
+    Gets the position of a packed card in FULL_DECK, used as its bit in a used-card mask
+    Args: card (int)
+    Returns: int
+    """
+    return ((card & 0xF) - 2) * 4 + (card >> 4)
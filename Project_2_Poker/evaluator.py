@@ -1,106 +1,143 @@
 from itertools import combinations
-from collections import Counter
 
 COMBO_VALUE_MAP = {"high_card": 0, "one_pair": 1, "two_pair": 2,
                     "three_of_a_kind": 3, "straight": 4, "flush": 5,
                     "full_house": 6, "four_of_a_kind": 7, "straight_flush": 8, "royal_flush": 9}
 
-CARD_VALUE_MAP = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
-                  '7': 7, '8': 8, '9': 9, 'T': 10,
-                  'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+# maps how many times each distinct card value appears (most to least) to the hand rank
+PATTERN_TABLE = {(4, 1): 7, (3, 2): 6, (3, 1, 1): 3, (2, 2, 1): 2, (2, 1, 1, 1): 1, (1, 1, 1, 1, 1): 0}
 
-def check_straight(values):
+# every 5 card straight as a rank bitmask, 2-6 up to T-A, plus the wheel (ace low straight) A-2-3-4-5
+STRAIGHT_MASKS = frozenset([0x1F << low for low in range(2, 11)] + [0x403C])
+
+# every way to pick 5 of the 7 cards by position
+SEVEN_CARD_COMBOS = tuple(combinations(range(7), 5))
+
+# best hand scores filled in as hands are seen, keyed by the flush suit's card value bitmask or by card value counts
+FLUSH_TABLE = {}
+RANK_TABLE = {}
+
+def check_straight(rank_mask):
     """
-    Checks if a given list of card values contains a straight or a wheel
-    Args: values (list[int])
+    Checks if the rank bitmask (bit r set for each rank r) of 5 distinct card values is a straight or a wheel
+    Args: rank_mask (int)
     Returns: bool: True or False
     """
-    # turn to set to remove duplicate and turn back to list so sort from high to low 
-    values = list(set(values))
-    values.sort(reverse=True)
-
-    # if it is a straight the difference between the high card and low card will be 4
-    for i in range(len(values) - 4):
-        if values[i] - values[i + 4] == 4:
-            return True
+    return rank_mask in STRAIGHT_MASKS
 
-    # checking wheel (ace low straight)
-    ace_low_straight = set([14, 2, 3, 4, 5])
-    if ace_low_straight.issubset(values):
-        return True
-
-    return False
+def pack_score(rank, values):
+    """
+    Packs a hand rank and up to 5 tie-breaking values into a single int
+    Args: rank (int), values (list[int])
+    Returns: int
+    """
+    score = rank
+    for value in values:
+        score = (score << 4) | value
+    return score << (4 * (5 - len(values)))    # left align so shorter tie-break lists still line up
 
 def rank_five_card_hand(hand):
     """
-    Evaluates a 5 card hand and determines its rank and tie-breaking values
-    Args: hand (list[Card])
-    Returns: tuple[int, list[int]] where it is (rank, list of cards)
+    Evaluates a 5 card hand and packs its rank and tie-breaking values into one score
+    Args: hand (list[int]) of packed cards
+    Returns: int where the rank sits above 4 bits per tie-breaking card so scores compare directly
     """
-    values = sorted([CARD_VALUE_MAP[c.card_num] for c in hand], reverse=True)   # convert hand to its card value and sort it from high to low
-    suits = [c.suit for c in hand]  # get all the suits from the hand to check if it is a flush
-    value_counts = Counter(values)  # counts the how many of each card there is for 2/3/4 pairs and full house
-    is_flush = len(set(suits)) == 1
-    is_straight = check_straight(values)
-
+    ranks = [c & 0xF for c in hand]
+
+    # counts how many of each card there is for 2/3/4 pairs and full house, indexed by rank
+    counts = [0] * 15
+    rank_mask = 0
+    for r in ranks:
+        counts[r] += 1
+        rank_mask |= 1 << r
+
+    # distinct card values ordered by how often they appear then by value so quads/trips/pairs come before kickers
+    groups = sorted(set(ranks), key=lambda r: (counts[r], r), reverse=True)
+    rank = PATTERN_TABLE[tuple(counts[r] for r in groups)]
+    if rank:
+        return pack_score(rank, groups)
+
+    # only five distinct values can make a straight or flush
+    values = groups
+    suit = hand[0] >> 4
+    is_flush = all(c >> 4 == suit for c in hand)
+    is_straight = check_straight(rank_mask)
 
     # royal and straight flushes
     if is_flush and is_straight:
-        if max(values) == 14:
-            return (9, values)  # royal 
-        return (8, values)  # straight
-
-    # four of a kind
-    if 4 in value_counts.values():
-        four_of_a_kind = next(value for value, count in value_counts.items() if count == 4) # gets the card that has a count of 4
-        high_card = max([value for value in values if value != four_of_a_kind])
-        return (7, [four_of_a_kind, high_card]) 
-
-    # full house
-    if 3 in value_counts.values() and 2 in value_counts.values():
-        three_of_a_kind = next(value for value, count in value_counts.items() if count == 3) 
-        pair = next(value for value, count in value_counts.items() if count == 2) 
-        return (6, [three_of_a_kind, pair])  
+        if values[0] == 14:
+            return pack_score(9, values)  # royal 
+        return pack_score(8, values)  # straight
 
     # flush
     if is_flush:
-        return (5, values)
+        return pack_score(5, values)
 
     # straight
     if is_straight:
-        return (4, values)
-
-    # three of a kind
-    if 3 in value_counts.values():
-        three_of_a_kind = next(value for value, count in value_counts.items() if count == 3) 
-        high_cards = sorted([value for value in values if value != three_of_a_kind], reverse=True)[:2]
-        return (3, [three_of_a_kind] + high_cards)
-
-    # two pair
-    if list(value_counts.values()).count(2) == 2:   # turn to list and check if there are 2 pairs 
-        pairs = sorted([value for value, count in value_counts.items() if count == 2], reverse=True)
-        kicker = max([value for value in values if value not in pairs])
-        return (2, pairs + [kicker])
-
-    # one pair
-    if 2 in value_counts.values():
-        pair = next(value for value, count in value_counts.items() if count == 2) 
-        high_cards = sorted([value for value in values if value != pair], reverse=True)[:3]
-        return (1, [pair] + high_cards)
+        return pack_score(4, values)
 
     # high card
-    return (0, values)
+    return pack_score(0, values)
 
-def evaluate_hand(cards):
+def best_of_seven(cards):
+    """
+    Finds the best 5 card score out of exactly 7 cards
+    Args: cards (list[int]) of packed cards
+    Returns: int
     """
-    Finds the best possible 5 card hand
-    Args: cards (list[Card])
-    Returns: tuple[int, list[int]]
+    best_score = -1
+    for a, b, c, d, e in SEVEN_CARD_COMBOS:
+        score = rank_five_card_hand((cards[a], cards[b], cards[c], cards[d], cards[e]))
+        if score > best_score:
+            best_score = score
+    return best_score
+
+def best_hand_score(cards):
     """
-    best_rank = (-1, [])
+    Finds the best 5 card score by ranking every 5 card combination
+    Args: cards (list[int]) of packed cards
+    Returns: int
+    """
+    if len(cards) == 7:
+        return best_of_seven(cards)
 
     # combinations loops through all possible hands and ranks the hand 
-    for combo in combinations(cards, 5):
-        rank = rank_five_card_hand(combo)
-        best_rank = max(best_rank, rank)
-    return best_rank
\ No newline at end of file
+    return max(rank_five_card_hand(combo) for combo in combinations(cards, 5))
+
+def evaluate_hand(cards):
+    """
+    Finds the best possible 5 card hand, computing each distinct hand shape once and looking it up after
+    The lookup tables only cover 5 to 7 cards, larger hands rank every combination instead
+    Args: cards (list[int]) of packed cards
+    Returns: int or -1 when there are fewer than 5 cards
+    """
+    if len(cards) < 5:
+        return -1
+    if len(cards) > 7:
+        return best_hand_score(cards)
+
+    suit_counts = [0, 0, 0, 0]
+    suit_masks = [0, 0, 0, 0]
+    count_key = 0
+    for c in cards:
+        suit = c >> 4
+        suit_counts[suit] += 1
+        suit_masks[suit] |= 1 << (c & 0xF)
+        count_key += 1 << (3 * (c & 0xF))   # 3 bits per card value holds how many of that value there are
+
+    # with at most 7 cards, 5+ of one suit beat anything the off-suit cards can make, so only the flush suit's values matter
+    for suit in range(4):
+        if suit_counts[suit] >= 5:
+            score = FLUSH_TABLE.get(suit_masks[suit])
+            if score is None:
+                score = best_hand_score([c for c in cards if c >> 4 == suit])
+                FLUSH_TABLE[suit_masks[suit]] = score
+            return score
+
+    # without a flush the suits don't matter so the score only depends on how many of each card value there are
+    score = RANK_TABLE.get(count_key)
+    if score is None:
+        score = best_hand_score(cards)
+        RANK_TABLE[count_key] = score
+    return score
@@ -1,16 +1,16 @@
-from deck import Card
-from mcts import run_mcts
+from deck import CARD_LOOKUP, card_to_str
+from mcts import run_parallel_mcts
 import sys
 
 def parse_cards(card1, card2):
     """
-    Parses two card strings and creates Card objects
+    Parses two card strings by looking up their packed card ints
     Args: card1_str (str), card2_str (str)
-    Returns: list[Card] or a string with usage format
+    Returns: list[int] or a string with usage format
     """
     if len(card1) != 2 or len(card2) != 2:
         return "Cards must be in format like 'JD' or 'QS'"
-    return [Card(card1[0].upper(), card1[1].upper()), Card(card2[0].upper(), card2[1].upper())]
+    return [CARD_LOOKUP[card1.upper()], CARD_LOOKUP[card2.upper()]]
 
 def main():
     """Handles command-line arguments, runs the MCTS simulation, and prints the result"""
@@ -19,8 +19,8 @@ def main():
         return
 
     hand = parse_cards(sys.argv[1], sys.argv[2])
-    print(f"Running MCTS for hand: {hand[0]} {hand[1]}")
-    estimated_winrate = run_mcts(hand, iterations=1000)
+    print(f"Running MCTS for hand: {card_to_str(hand[0])} {card_to_str(hand[1])}")
+    estimated_winrate = run_parallel_mcts(hand, iterations=1000)
     print(f"Estimated Win Rate: {estimated_winrate:.3f}")
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
 import math
-from itertools import combinations
+import os
+from bisect import bisect_right
+from math import comb
+from concurrent.futures import ProcessPoolExecutor
 from evaluator import evaluate_hand
-from deck import Deck
-from random import sample
+from deck import FULL_DECK, card_to_idx
+from random import sample, seed
+
+# BINOMIALS[i][c] is C(c, i), enough for drawing up to 3 cards at a time out of a deck
+BINOMIALS = [[comb(c, i) for c in range(53)] for i in range(4)]
 
 class MCTSNode:
     def __init__(self, state, parent=None, stage='root', player_hand=None):
@@ -15,14 +21,6 @@ class MCTSNode:
         self.player_hand = player_hand
         self.untried_actions = []
 
-    def ucb1(self, n, c=math.sqrt(2)):
-        """
-        Calculates the UCB1 score
-        Args: n (int), c (math.sqrt(2))
-        Returns: float
-        """
-        return (self.wins / self.visits) + c * math.sqrt(math.log(n) / self.visits)
-
     def is_fully_expanded(self):
         """Checks if all possible actions from this node have been tried"""
         return len(self.untried_actions) == 0
@@ -34,12 +32,15 @@ class MCTSNode:
         Returns: MCTSNode
         """
         n = sum(child.visits for child in self.children.values())   # total number of simulations
+        log_n = math.log(n) if n > 0 else 0.0   # same for every child so only compute it once
         best_score = -1
         best_node = None
 
-        # finds child with highest ucb1 score
+        # finds child with highest ucb1 score, unvisited children get picked first
         for child in self.children.values():
-            ucb_score = child.ucb1(n, c)
+            if child.visits == 0:
+                return child
+            ucb_score = (child.wins / child.visits) + c * math.sqrt(log_n / child.visits)
             if ucb_score > best_score:
                 best_score = ucb_score
                 best_node = child
@@ -81,64 +82,87 @@ class MCTSNode:
         Args: result (float)
         Returns: N/A
         """
-        self.visits += 1
-        self.wins += result
-        if self.parent:
-            self.parent.backpropagate(result)
+        # walk up to the root in a loop instead of recursing once per level
+        node = self
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            node = node.parent
 
 
+def remaining_cards(used_cards):
+    """
+    Gets the cards that are not used yet by masking them out of the full deck
+    Args: used_cards (list[int])
+    Returns: list[int]
+    """
+    used_mask = 0
+    for card in used_cards:
+        used_mask |= 1 << card_to_idx(card)
+    return [FULL_DECK[idx] for idx in range(52) if not (used_mask >> idx) & 1]
+
+def unrank_combination(r, n, k):
+    """
+    Decodes a rank in [0, C(n, k)) to its combination of k indices in [0, n) using the combinatorial number system
+    Args: r (int), n (int), k (int)
+    Returns: tuple[int]
+    """
+    combo = []
+    # pick indices from the largest down, each one is the biggest c with C(c, i) <= r
+    for i in range(k, 0, -1):
+        c = bisect_right(BINOMIALS[i], r, 0, n) - 1
+        combo.append(c)
+        r -= BINOMIALS[i][c]
+        n = c
+    return tuple(combo)
+
+def sample_combos(cards, size, k):
+    """
+    Samples k distinct combinations of the given size by drawing ranks and decoding them instead of building every combination
+    Args: cards (list[int]), size (int), k (int)
+    Returns: list[tuple[int]]
+    """
+    total = BINOMIALS[size][len(cards)]
+    ranks = sample(range(total), min(k, total))
+    return [tuple(cards[i] for i in unrank_combination(r, len(cards), size)) for r in ranks]
+
 def sample_opponent_hands(player_hand):
     """
     Samples opponents possible hand from the remaining 50 cards
-    Args: player_hand (list[Card])
-    Returns: list[tuple[Card]]
+    Args: player_hand (list[int])
+    Returns: list[tuple[int]]
     """
-    deck = Deck()
-    deck.remove_card(player_hand[0])
-    deck.remove_card(player_hand[1])
-    combos = list(combinations(deck.remaining_cards(), 2))
-    k = min(1000, len(combos))
-    return sample(combos, k)
+    return sample_combos(remaining_cards(player_hand), 2, 1000)
 
 
 def sample_flops(used_cards):
     """
     Samples possible flops from the remaining cards
-    Args: used_cards (list[Card])
-    Returns: list[tuple[Card]]
+    Args: used_cards (list[int])
+    Returns: list[tuple[int]]
     """
-    deck = Deck()
-    remaining = [card for card in deck.cards if card not in used_cards]
-    combos = list(combinations(remaining, 3))
-    k = min(1000, len(combos))
-    return sample(combos, k)
+    return sample_combos(remaining_cards(used_cards), 3, 1000)
 
 def sample_turns(used_cards):
     """
     Samples possible turns from the remaining cards
-    Args: used_cards (list[Card])
-    Returns: list[tuple[Card]] 
+    Args: used_cards (list[int])
+    Returns: list[tuple[int]] 
     """
-    deck = Deck()
-    remaining = [card for card in deck.cards if card not in used_cards]
-    k = min(1000, len(remaining))
-    return sample([(card,) for card in remaining], k)   # needs to be in card, for formatting in tuples (caused errors earlier)
+    return sample_combos(remaining_cards(used_cards), 1, 1000)
 
 def sample_rivers(used_cards):
     """
     Samples possible rivers from the remaining cards
-    Args: used_cards (list[Card])
-    Returns: list[tuple[Card]]
+    Args: used_cards (list[int])
+    Returns: list[tuple[int]]
     """
-    deck = Deck()
-    remaining = [card for card in deck.cards if card not in used_cards]
-    k = min(1000, len(remaining))
-    return sample([(card,) for card in remaining], k) 
+    return sample_combos(remaining_cards(used_cards), 1, 1000)
 
 def rollout_simulation(player_hand, opponent_hand, board):
     """
     Compares player and opponent hands with the board to the winner
-    Args: player_hand (list[Card]), opponent_hand (list[Card]), board (list[Card])
+    Args: player_hand (list[int]), opponent_hand (list[int]), board (list[int])
     Returns: 1, 0, or 0.5 depending on who wins
     """
     full_player_hand = player_hand + board
@@ -154,17 +178,14 @@ def rollout_simulation(player_hand, opponent_hand, board):
     else:
         return 0.5  # tie
 
-def simulate_to_end(node):
+def deal_to_end(node):
     """
-    Performs the MCTS simulation
+    Deals the cards the node hasn't decided yet so the hand can be played out
     Args: node (MCTSNode)
-    Returns: 1, 0, or 0.5 depending on who wins
+    Returns: tuple[list[int], list[int]] (opponent_hand, community_cards)
     """
-    # remove all used cards from the deck
-    deck = Deck()
-    used = node.player_hand + node.state
-    for card in used:
-        deck.remove_card(card)
+    # draw every card that is still missing (2 for the opponent + 5 for the board) in one go from the unused cards
+    undealt = sample(remaining_cards(node.player_hand + node.state), 7 - len(node.state))
 
     # assigns cards based on the stage of the game
     opponent_hand = []
@@ -183,20 +204,21 @@ def simulate_to_end(node):
     
     # ensures that the opponent has a hand 
     if not opponent_hand:
-        opponent_hand = deck.deal_hand(2)
+        opponent_hand = undealt[:2]
+        undealt = undealt[2:]
     
     # ensures that the board has cards 
     cards_needed = 5 - len(community_cards)
     if cards_needed > 0:
-        community_cards.extend(deck.deal_hand(cards_needed))
+        community_cards.extend(undealt[:cards_needed])
 
-    return rollout_simulation(node.player_hand, opponent_hand, community_cards)
+    return opponent_hand, community_cards
 
-def run_mcts(player_hand, iterations=1000):
+def build_tree(player_hand, iterations):
     """
-    Runs the MCTS algorithm for a given hand
-    Args: player_hand (list[Card]), iterations (int, 1000)
-    Returns: float
+    Builds the MCTS tree for a given hand
+    Args: player_hand (list[int]), iterations (int)
+    Returns: MCTSNode (root)
     """
     root = MCTSNode(state=[], stage='root', player_hand=player_hand)
     root.untried_actions = sample_opponent_hands(player_hand)
@@ -224,10 +246,52 @@ def run_mcts(player_hand, iterations=1000):
                 node = child_node 
 
         # simulation/ backpropagation
-        result = simulate_to_end(node)
+        opponent_hand, board = deal_to_end(node)
+        result = rollout_simulation(player_hand, opponent_hand, board)
         node.backpropagate(result)
 
+    return root
+
+def run_mcts(player_hand, iterations=1000):
+    """
+    Runs the MCTS algorithm for a given hand
+    Args: player_hand (list[int]), iterations (int, 1000)
+    Returns: float
+    """
+    root = build_tree(player_hand, iterations)
     if root.visits == 0:
         return 0.0
     
-    return root.wins / root.visits
\ No newline at end of file
+    return root.wins / root.visits
+
+def mcts_worker(player_hand, iterations):
+    """
+    Builds an independent MCTS tree in a worker process
+    Args: player_hand (list[int]), iterations (int)
+    Returns: tuple[float, int] (wins, visits) at the root
+    """
+    seed()  # forked workers start with the parent's random state so reseed to get different samples
+    root = build_tree(player_hand, iterations)
+    return root.wins, root.visits
+
+def run_parallel_mcts(player_hand, iterations=1000, workers=None):
+    """
+    Splits the MCTS iterations across processes, each building its own tree, and combines their root stats
+    Args: player_hand (list[int]), iterations (int, 1000), workers (int, None uses every core)
+    Returns: float
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, iterations))
+    if workers == 1:
+        return run_mcts(player_hand, iterations)
+
+    # spread the iterations as evenly as possible
+    splits = [iterations // workers + (1 if i < iterations % workers else 0) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(mcts_worker, [player_hand] * workers, splits))
+
+    wins = sum(w for w, _ in results)
+    visits = sum(v for _, v in results)
+    if visits == 0:
+        return 0.0
+
+    return wins / visits
\ No newline at end of file